@@ -14,41 +14,60 @@
     - 某项缺失则输出空字符串
 """
 
+import asyncio
+import functools
+import html as html_lib
 import json
 import re
+import subprocess
 import sys
+from collections import defaultdict
 from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import shutil
 from io import BytesIO
 
 
-from bs4 import BeautifulSoup
 try:
     import gradio as gr
 except ImportError:
     gr = None
 
+# 大块 JSON（__NEXT_DATA__ / API 响应）优先用 orjson 解析，没装则退回标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 try:
     from PIL import Image
 except ImportError:
     Image = None
 
 
+# 脚本目录、输出目录与默认预览图路径只在模块加载时计算一次
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_OUTPUT_DIR = os.path.join(_SCRIPT_DIR, "output")
+_DEFAULT_PNG = os.path.join(_SCRIPT_DIR, "default.png")
+
 
 # ================== 代理设置（从 config.json 读取） ==================
 # 若使用代理，请在config.json中设置端口号；若缺失config.json 或将enable_proxy设置为false，则不走代理。
 
+@functools.lru_cache(maxsize=1)
 def load_proxies_from_config() -> Optional[Dict[str, str]]:
     """从 config.json 中读取代理配置，返回给 requests 使用的 proxies 字典。
 
     返回值示例：{"http": "http://127.0.0.1:49254", "https": "http://127.0.0.1:49254"}
     如果未启用代理或配置无效，则返回 None。
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, "config.json")
+    config_path = os.path.join(_SCRIPT_DIR, "config.json")
 
     try:
         with open(config_path, "r", encoding="utf-8") as f:
@@ -90,8 +109,59 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 }
 
+# 常用正则在模块加载时预编译，避免每次调用都查 re 模块缓存
+_RE_MODEL_ID = re.compile(r"/models/(\d+)")
+_RE_VERSION_ID = re.compile(r"[?&]modelVersionId=(\d+)")
+_RE_FILENAME = re.compile(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', re.IGNORECASE)
+
+# <script id="__NEXT_DATA__"> 的定位标记
+_NEXT_DATA_MARKER = 'id="__NEXT_DATA__"'
+
+# 预览图兜底：直接在原始 HTML 上用正则找 <img>，不再构建 DOM
+# （lookahead 保证 class 与 src 的属性顺序无关）
+_RE_EDGE_IMG = re.compile(
+    r'<img\b(?=[^>]*\sclass="[^"]*EdgeImage_image__)[^>]*\ssrc="(https://image\.civitai\.com/[^"]+)"',
+    re.IGNORECASE,
+)
+_RE_ANY_IMG = re.compile(
+    r'<img\b[^>]*\ssrc="(https://image\.civitai\.com/[^"]+)"',
+    re.IGNORECASE,
+)
+
+# JSON 中的文件名带这些扩展名时，直接信任，不再 HEAD 请求真实文件名
+MODEL_FILE_EXTENSIONS = (".safetensors", ".ckpt", ".pt")
+
+# 预览图最长边上限，下载后按此尺寸缩略再保存
+PREVIEW_MAX_SIZE = (1024, 1024)
+
+
+
+def create_session() -> requests.Session:
+    """创建全局共享的 requests.Session：统一请求头，并复用 keep-alive 连接池。
+
+    注意：代理不挂在 session.proxies 上（那样会被 HTTP(S)_PROXY 环境变量覆盖），
+    而是每次请求显式传 proxies=PROXIES，保证 config.json 的设置优先。
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = create_session()
+
 TARGET_FIELDS = ["Type", "Published", "Base Model", "Usage Tips", "Trigger Words", "Hash", "File Name"]
 
+# 详情 TXT 模板：每个字段一行，最后附上 URL
+_TXT_TEMPLATE = "".join(f"{key}: {{{key}}}\n" for key in TARGET_FIELDS) + "URL: {URL}\n"
+
 
 def extract_ids_from_url(url: str) -> Tuple[Optional[int], Optional[int]]:
     """
@@ -100,17 +170,17 @@ def extract_ids_from_url(url: str) -> Tuple[Optional[int], Optional[int]]:
       https://civitai.com/models/2185778/z-image...
       https://civitai.com/models/2185778?modelVersionId=123456
     """
-    m = re.search(r"/models/(\d+)", url)
+    m = _RE_MODEL_ID.search(url)
     model_id = int(m.group(1)) if m else None
 
-    vm = re.search(r"[?&]modelVersionId=(\d+)", url)
+    vm = _RE_VERSION_ID.search(url)
     version_id = int(vm.group(1)) if vm else None
 
     return model_id, version_id
 
 
 def fetch_html(url: str) -> str:
-    resp = requests.get(url, headers=HEADERS, timeout=30, proxies=PROXIES)
+    resp = SESSION.get(url, timeout=30, proxies=PROXIES)
     resp.raise_for_status()
     return resp.text
 
@@ -119,49 +189,43 @@ def extract_next_data(html: str) -> Any:
     """
     从 HTML 中找出 __NEXT_DATA__ 的 JSON。
     """
-    m = re.search(
-        r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>',
-        html,
-        re.DOTALL | re.IGNORECASE,
-    )
-    if not m:
+    # 直接按标记做字符串查找，比 DOTALL 正则扫一遍整页更快
+    i = html.find(_NEXT_DATA_MARKER)
+    if i < 0:
+        return None
+    j = html.find(">", i) + 1
+    if j <= 0:
+        return None
+    k = html.find("</script>", j)
+    if k < 0:
         return None
 
-    raw = m.group(1).strip()
+    raw = html[j:k].strip()
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return _json_loads(raw)
+    except ValueError:
         # 简单兜底：有时会 HTML 实体编码
         raw = raw.replace("&quot;", '"')
-        return json.loads(raw)
+        return _json_loads(raw)
 
 
 def extract_preview_image_url(html: str) -> Optional[str]:
-    """从页面 HTML 中粗略提取第一张预览图的 URL。
+    """从页面 HTML 中粗略提取第一张预览图的 URL（正则扫描，不构建 DOM）。
 
     规则：
       1. 优先找 class 里包含 EdgeImage_image__ 且 src 来自 image.civitai.com 的 <img>
       2. 如果找不到，再兜底：页面上第一张 src 含 image.civitai.com 的图片
     """
-    try:
-        soup = BeautifulSoup(html, "html.parser")
-    except Exception:
-        return None
-
     # 方案 A：优先 EdgeImage_image__
-    for img in soup.find_all("img"):
-        src = img.get("src") or ""
-        classes = " ".join(img.get("class") or [])
-        if "image.civitai.com" in src and "EdgeImage_image__" in classes:
-            return src
-
+    m = _RE_EDGE_IMG.search(html)
     # 方案 B：兜底，只要来自 image.civitai.com 的第一张图片
-    for img in soup.find_all("img"):
-        src = img.get("src") or ""
-        if "image.civitai.com" in src:
-            return src
+    if not m:
+        m = _RE_ANY_IMG.search(html)
+    if not m:
+        return None
 
-    return None
+    # src 属性里的 &amp; 等实体需要还原
+    return html_lib.unescape(m.group(1))
 
 
 def find_model_from_trpc(next_data: Any, model_id: Optional[int]) -> Optional[Dict[str, Any]]:
@@ -176,28 +240,25 @@ def find_model_from_trpc(next_data: Any, model_id: Optional[int]) -> Optional[Di
     except Exception:
         return None
 
-    candidate = None
-
-    for q in queries:
-        key = q.get("queryKey")
-        if not isinstance(key, list) or not key:
-            continue
-        # key 形如: [ ["model","getById"], {"input": {...}} ]
-        first = key[0]
-        if (
-            isinstance(first, list)
-            and len(first) >= 2
-            and first[0] == "model"
-            and first[1] == "getById"
-        ):
-            data = q.get("state", {}).get("data")
-            if not isinstance(data, dict):
-                continue
-            if model_id is None or data.get("id") == model_id:
-                return data
-            candidate = data  # 作为兜底
+    # key 形如: [ ["model","getById"], {"input": {...}} ]
+    # 用生成器按需遍历，命中即停，不必走完整个 queries
+    candidates = (
+        data
+        for q in queries
+        if isinstance(q, dict)
+        and isinstance(key := q.get("queryKey"), list)
+        and key
+        and isinstance(key[0], list)
+        and key[0][:2] == ["model", "getById"]
+        and isinstance(data := (q.get("state") or {}).get("data"), dict)
+    )
 
-    return candidate
+    first = next(candidates, None)
+    if first is None or model_id is None or first.get("id") == model_id:
+        return first
+
+    # 第一条 id 对不上时继续往后找，都对不上就用第一条兜底
+    return next((d for d in candidates if d.get("id") == model_id), first)
 
 
 def choose_model_version(
@@ -215,12 +276,8 @@ def choose_model_version(
             except Exception:
                 continue
 
-    # 没指定版本时：优先按 publishedAt 降序找最近的一个
-    def _published_ts(v: Dict[str, Any]) -> str:
-        return str(v.get("publishedAt") or "")
-
-    versions_sorted = sorted(versions, key=_published_ts, reverse=True)
-    return versions_sorted[0]
+    # 没指定版本时：取 publishedAt 最近的一个
+    return max(versions, key=lambda v: str(v.get("publishedAt") or ""))
 
 
 def build_usage_tips(version: Dict[str, Any]) -> str:
@@ -261,29 +318,39 @@ def fetch_real_filename(file_url: str) -> Optional[str]:
     如果失败就返回 None。
     """
     try:
-        resp = requests.head(file_url, headers=HEADERS, timeout=30, proxies=PROXIES, allow_redirects=True)
+        resp = SESSION.head(file_url, timeout=30, proxies=PROXIES, allow_redirects=True)
         cd = resp.headers.get("Content-Disposition") or resp.headers.get("content-disposition")
         if not cd:
             return None
 
         # 常见格式类似：attachment; filename="AmeAni.safetensors"
-        m = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', cd, re.IGNORECASE)
+        m = _RE_FILENAME.search(cd)
         if not m:
             return None
 
         filename = m.group(1).strip()
         # 有些情况下可能是 URL 编码
-        try:
-            from urllib.parse import unquote
-            filename = unquote(filename)
-        except Exception:
-            pass
-
-        return filename
+        return unquote(filename)
     except Exception:
         return None
 
 
+def preview_from_version(version_data: Dict[str, Any]) -> Optional[str]:
+    """从 trpcState 里的 modelVersion.images 取第一张预览图 URL。
+
+    只接受完整的 http(s) 地址；拿不到时返回 None，由调用方再走 API 兜底。
+    """
+    images = version_data.get("images") or []
+    if not isinstance(images, list) or not images or not isinstance(images[0], dict):
+        return None
+
+    url = str(images[0].get("url") or "").strip()
+    if not url.startswith("http"):
+        return None
+
+    return url
+
+
 def fetch_preview_image_url_from_api(
     model_id: Optional[int],
     version_id: Optional[int],
@@ -296,14 +363,14 @@ def fetch_preview_image_url_from_api(
 
     api_url = f"https://civitai.com/api/v1/models/{model_id}"
     try:
-        resp = requests.get(api_url, headers=HEADERS, timeout=30, proxies=PROXIES)
+        resp = SESSION.get(api_url, timeout=30, proxies=PROXIES)
         resp.raise_for_status()
     except Exception as e:
         print(f"[warn] 调用 Civitai API 失败：{e}")
         return None
 
     try:
-        data = resp.json()
+        data = _json_loads(resp.content)
     except Exception:
         return None
 
@@ -341,77 +408,96 @@ def fetch_preview_image_url_from_api(
 
 
 
+# save_preview_image 的默认参数：表示调用方还没尝试下载过预览图
+_NOT_FETCHED = object()
+
+
+def download_preview_image(preview_url: Optional[str]) -> Any:
+    """下载预览图，失败或 preview_url 为空时返回 None。
+
+    装了 Pillow 时解码并缩到 PREVIEW_MAX_SIZE 以内，返回 Image 对象；
+    没装 Pillow 时返回原始字节。
+    """
+    if not preview_url:
+        return None
+
+    try:
+        resp = SESSION.get(preview_url, timeout=30, proxies=PROXIES)
+        resp.raise_for_status()
+        content = resp.content
+
+        if Image is None:
+            return content
+
+        img = Image.open(BytesIO(content))
+        # 先 thumbnail 再 load：JPEG 可以直接按缩小后的尺寸解码
+        img.thumbnail(PREVIEW_MAX_SIZE, Image.Resampling.LANCZOS)
+        img.load()  # 强制解码（图比上限还小时 thumbnail 不会触发解码）
+        return img
+    except Exception as e:
+        # 下载或解码失败则由调用方退回使用 default.png
+        print(f"[warn] 下载预览图失败：{e}，使用 default.png 代替")
+        return None
+
+
 def save_preview_image(
     preview_url: Optional[str],
     model_file_name: str,
-    proxies: Optional[Dict[str, str]] = None,
-    headers: Optional[Dict[str, str]] = None,
+    preview: Any = _NOT_FETCHED,
 ) -> None:
     """根据模型文件名保存预览图到 ./output/xxx.png。
 
-    - 如果给出了 preview_url，则先尝试直接下载
+    - 如果传入了 preview（含下载失败得到的 None），直接使用；没传时才按 preview_url 下载
     - 若下载失败或 preview_url 为空，则复制脚本目录下的 default.png
     - 所有图片统一保存到脚本根目录下的 output 文件夹中
     """
-    # 1. 计算输出目录与目标文件路径
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_dir = os.path.join(script_dir, "output")
-    os.makedirs(output_dir, exist_ok=True)
+    # 1. 确保输出目录存在（GUI 运行期间可能被删掉），计算目标文件路径
+    os.makedirs(_OUTPUT_DIR, exist_ok=True)
 
     base, _ = os.path.splitext(model_file_name or "")
     if not base:
         base = "preview"
-    target_path = os.path.join(output_dir, base + ".png")
+    target_path = os.path.join(_OUTPUT_DIR, base + ".png")
+
+    # 2. 调用方没有预先下载过时，才尝试按 preview_url 下载
+    if preview is _NOT_FETCHED:
+        preview = download_preview_image(preview_url)
 
-    # 2. 若有 preview_url，优先尝试下载
-    if preview_url:
+    if isinstance(preview, bytes):
+        # 没装 Pillow 时的兜底：直接写原始内容
         try:
-            resp = requests.get(
-                preview_url,
-                headers=headers or {},
-                proxies=proxies,
-                timeout=30,
-            )
-            resp.raise_for_status()
-            content = resp.content
-
-            # 尽量通过 Pillow 统一转成标准 RGB PNG，避免缩略图异常
-            if Image is not None:
-                try:
-                    img = Image.open(BytesIO(content))
-                    img.load()  # 强制解码
-
-                    # 如果带有透明通道或其他奇怪的 mode，就铺一层白底转成 RGB
-                    if img.mode not in ("RGB", "L"):
-                        background = Image.new("RGB", img.size, (255, 255, 255))
-                        if "A" in img.getbands():
-                            alpha = img.split()[-1]
-                            background.paste(img, mask=alpha)
-                        else:
-                            background.paste(img)
-                        img = background
-                    else:
-                        img = img.convert("RGB")
-
-                    img.save(target_path, format="PNG")
-                    return
-                except Exception:
-                    # Pillow 失败就退回到直接写原始内容
-                    pass
-
-            # 没装 Pillow 或转换失败时的兜底：直接写原始内容
             with open(target_path, "wb") as f:
-                f.write(content)
+                f.write(preview)
+            return
+        except Exception as e:
+            print(f"[warn] 写入预览图失败：{e}，使用 default.png 代替")
+    elif preview is not None:
+        # 通过 Pillow 统一转成标准 RGB PNG，避免缩略图异常
+        try:
+            img = preview
+
+            # 如果带有透明通道或其他奇怪的 mode，就铺一层白底转成 RGB
+            if img.mode not in ("RGB", "L"):
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                if "A" in img.getbands():
+                    alpha = img.split()[-1]
+                    background.paste(img, mask=alpha)
+                else:
+                    background.paste(img)
+                img = background
+            else:
+                img = img.convert("RGB")
+
+            # 预览图只用于本地展示，用低压缩等级换取更快的 PNG 编码
+            img.save(target_path, format="PNG", optimize=False, compress_level=1)
             return
         except Exception as e:
-            # 下载失败则退回使用 default.png
-            print(f"[warn] 下载预览图失败：{e}，使用 default.png 代替")
+            print(f"[warn] 保存预览图失败：{e}，使用 default.png 代替")
 
     # 3. 使用默认图 default.png
-    default_path = os.path.join(script_dir, "default.png")
-    if os.path.exists(default_path):
+    if os.path.exists(_DEFAULT_PNG):
         try:
-            shutil.copyfile(default_path, target_path)
+            shutil.copyfile(_DEFAULT_PNG, target_path)
         except Exception as e:
             print(f"[warn] 复制 default.png 失败：{e}")
     else:
@@ -424,28 +510,20 @@ def save_details_txt(
     url: str,
 ) -> None:
     """把抓取到的字段写入 output/file_name.txt 里面，并附上一行 URL。"""
-    # 1. 计算输出目录
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_dir = os.path.join(script_dir, "output")
-    os.makedirs(output_dir, exist_ok=True)
+    # 1. 确保输出目录存在，计算基础文件名：优先用 File Name（去掉扩展名）
+    os.makedirs(_OUTPUT_DIR, exist_ok=True)
 
-    # 2. 计算基础文件名：优先用 File Name（去掉扩展名）
     file_name = details.get("File Name", "") or ""
     base, _ = os.path.splitext(file_name)
     if not base:
         # 如果实在拿不到模型文件名，就兜底一个占位名字
         base = "model"
 
-    txt_path = os.path.join(output_dir, base + ".txt")
+    txt_path = os.path.join(_OUTPUT_DIR, base + ".txt")
 
-    # 3. 按行写入所有字段 + URL
-    lines: List[str] = []
-    for key in TARGET_FIELDS:
-        value = details.get(key, "")
-        lines.append(f"{key}: {value}")
-    lines.append(f"URL: {url}")
-
-    text = "\n".join(lines) + "\n"
+    # 2. 按行写入所有字段 + URL
+    # 缺失的字段由 defaultdict 补成空字符串
+    text = _TXT_TEMPLATE.format_map(defaultdict(str, details, URL=url))
 
     try:
         with open(txt_path, "w", encoding="utf-8") as f:
@@ -500,55 +578,54 @@ def extract_fields(
     hash_value = ""
     file_name = ""
     files = version_data.get("files") or []
-    for f in files:
-        # 只取模型文件（通常 type 为 'Model'）
-        if f.get("type") == "Model" or f.get("type") == "model":
-            # 先尝试通过 HEAD 请求拿真实下载文件名
-            file_url = f.get("url")
-            if file_url:
-                real_name = fetch_real_filename(file_url)
-                if real_name:
-                    file_name = real_name
-                else:
-                    # 兜底：用 JSON 里的 name 字段
-                    file_name = str(f.get("name") or "").strip()
-
-            raw_hashes = f.get("hashes") or []
-            auto_v2 = ""
-            hash_type = "AUTOV2"
-
-            # hashes 可能是 list，也可能是 dict，我们都兼容一下
-            if isinstance(raw_hashes, dict):
-                auto_v2 = str(
-                    raw_hashes.get("AutoV2")
-                    or raw_hashes.get("AUTOV2")
-                    or ""
-                ).strip()
-            elif isinstance(raw_hashes, (list, tuple)):
-                # 优先找 AutoV2，没有就退而求其次
-                preferred_order = ["AUTOV2", "AutoV2", "SHA256", "SHA1", "CRC32"]
-                chosen_type = ""
-                chosen_hash = ""
-
-                for t in preferred_order:
-                    for h in raw_hashes:
-                        if not isinstance(h, dict):
-                            continue
-                        ht = str(h.get("type") or "").upper()
-                        if ht == t.upper() and h.get("hash"):
-                            chosen_type = ht
-                            chosen_hash = str(h["hash"]).strip()
-                            break
-                    if chosen_hash:
-                        break
-
-                if chosen_hash:
-                    hash_type = chosen_type
-                    auto_v2 = chosen_hash
-
-            if auto_v2:
-                hash_value = f"{hash_type} | {auto_v2}"
-            break
+    # 只取模型文件（通常 type 为 'Model'），type 统一小写后比较一次
+    model_file = next(
+        (
+            f
+            for f in files
+            if isinstance(f, dict) and str(f.get("type") or "").lower() == "model"
+        ),
+        None,
+    )
+    if model_file:
+        # 先用 JSON 里的 name 字段，通常就是真实下载文件名
+        file_name = str(model_file.get("name") or "").strip()
+
+        # 只有 name 为空或没有模型扩展名时，才 HEAD 请求拿真实下载文件名
+        file_url = model_file.get("url")
+        if file_url and not file_name.lower().endswith(MODEL_FILE_EXTENSIONS):
+            real_name = fetch_real_filename(file_url)
+            if real_name:
+                file_name = real_name
+
+        raw_hashes = model_file.get("hashes") or []
+        auto_v2 = ""
+        hash_type = "AUTOV2"
+
+        # hashes 可能是 list，也可能是 dict，我们都兼容一下
+        if isinstance(raw_hashes, dict):
+            auto_v2 = str(
+                raw_hashes.get("AutoV2")
+                or raw_hashes.get("AUTOV2")
+                or ""
+            ).strip()
+        elif isinstance(raw_hashes, (list, tuple)):
+            # 先按 type（统一大写）分桶，一次遍历；同类型保留第一个
+            hmap: Dict[str, str] = {}
+            for h in raw_hashes:
+                if isinstance(h, dict) and h.get("hash"):
+                    hmap.setdefault(
+                        str(h.get("type") or "").upper(), str(h["hash"]).strip()
+                    )
+
+            # 优先找 AutoV2，没有就退而求其次
+            for t in ("AUTOV2", "SHA256", "SHA1", "CRC32"):
+                if hmap.get(t):
+                    hash_type, auto_v2 = t, hmap[t]
+                    break
+
+        if auto_v2:
+            hash_value = f"{hash_type} | {auto_v2}"
 
     result["Hash"] = hash_value
     result["File Name"] = file_name
@@ -557,38 +634,86 @@ def extract_fields(
     return result
 
 
-def extract_details_from_url(url: str) -> Tuple[Dict[str, str], Optional[str]]:
-    """抓取模型详情字段，同时返回预览图 URL（如果能找到的话）。"""
+async def _fetch_preview(
+    html: str,
+    version_data: Optional[Dict[str, Any]],
+    model_id: Optional[int],
+    version_id: Optional[int],
+) -> Tuple[Optional[str], Any]:
+    """确定预览图 URL 并下载，返回 (预览图 URL, 预览图)。
+
+    - 有 version_data 时：trpcState 的 images → API → HTML 刮图
+    - 没有 version_data 时：先刮 HTML（不花网络请求），刮不到再调 API
+    """
+    if version_data:
+        # 1️⃣ 优先用 trpcState 里当前版本自带的 images，省掉一次 API 请求
+        preview_url = preview_from_version(version_data)
+
+        # 2️⃣ 没有的话再调 API（与模型版本严格对应）
+        if not preview_url:
+            preview_url = await asyncio.to_thread(
+                fetch_preview_image_url_from_api, model_id, version_id
+            )
+
+        # 3️⃣ 如果 API 也没给，再从 HTML 里刮图兜底
+        if not preview_url:
+            preview_url = extract_preview_image_url(html)
+    else:
+        # 没有 JSON 可用时，先试着从 HTML 里刮一张图，再用 API 兜底
+        preview_url = extract_preview_image_url(html)
+        if not preview_url:
+            preview_url = await asyncio.to_thread(
+                fetch_preview_image_url_from_api, model_id, version_id
+            )
+
+    preview = await asyncio.to_thread(download_preview_image, preview_url)
+    return preview_url, preview
+
+
+async def extract_details_async(
+    url: str,
+) -> Tuple[Dict[str, str], Optional[str], Any]:
+    """并发版抓取流程，返回 (详情字段, 预览图 URL, 预览图)。
+
+    拿到页面 JSON 后，取真实文件名（HEAD）与确定/下载预览图同时进行。
+    """
     model_id, version_id = extract_ids_from_url(url)
-    html = fetch_html(url)
+    html = await asyncio.to_thread(fetch_html, url)
 
     next_data = extract_next_data(html)
     if next_data is None:
-        # 没有 JSON 也先试着从 HTML 里刮一张图
-        preview_url = extract_preview_image_url(html)
+        # 没有 JSON 时只剩预览图可用
         empty = {k: "" for k in TARGET_FIELDS}
-        # 再用 API 兜底一次
-        if not preview_url:
-            preview_url = fetch_preview_image_url_from_api(model_id, version_id)
-        return empty, preview_url
+        preview_url, preview = await _fetch_preview(html, None, model_id, version_id)
+        return empty, preview_url, preview
 
     model_data = find_model_from_trpc(next_data, model_id)
     version_data = choose_model_version(model_data, version_id) if model_data else None
 
-    details = extract_fields(model_data, version_data)
+    # extract_fields 内部可能会 HEAD 文件直链，与预览图下载并行
+    details, (preview_url, preview) = await asyncio.gather(
+        asyncio.to_thread(extract_fields, model_data, version_data),
+        _fetch_preview(html, version_data, model_id, version_id),
+    )
+    return details, preview_url, preview
 
-    # 1️⃣ 优先通过 API 拿预览图（与模型版本严格对应）
-    preview_url = fetch_preview_image_url_from_api(model_id, version_id)
 
-    # 2️⃣ 如果 API 没给，再从 HTML 里刮图兜底
-    if not preview_url:
-        preview_url = extract_preview_image_url(html)
 
-    return details, preview_url
+# =================== 新增：Gradio/命令行主流程 ===================
 
+def open_output_dir() -> None:
+    """用系统文件管理器打开 output 文件夹，不经过 shell，也不阻塞当前流程。"""
+    if sys.platform == "win32":
+        os.startfile(_OUTPUT_DIR)
+        return
 
+    opener = "open" if sys.platform == "darwin" else "xdg-open"
+    subprocess.Popen(
+        [opener, _OUTPUT_DIR],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
-# =================== 新增：Gradio/命令行主流程 ===================
 
 def process_url(url: str, print_details: bool = False) -> str:
     """核心处理流程：给一个 Civitai URL，抓取信息并写入 output。
@@ -600,22 +725,20 @@ def process_url(url: str, print_details: bool = False) -> str:
         return "failed to fetch data. please check the url and try again."
 
     try:
-        details, preview_url = extract_details_from_url(url)
+        details, preview_url, preview = asyncio.run(extract_details_async(url))
 
         if print_details:
             for key in TARGET_FIELDS:
                 print(f"{key}: {details.get(key, '')}")
 
         file_name = details.get("File Name", "")
-        save_preview_image(preview_url, file_name, proxies=PROXIES, headers=HEADERS)
+        save_preview_image(preview_url, file_name, preview=preview)
         save_details_txt(details, url)
 
         # 只在 GUI 模式（print_details=False）下自动打开 output 文件夹
         if not print_details:
             try:
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                output_dir = os.path.join(script_dir, "output")
-                os.system(f'open "{output_dir}"')
+                open_output_dir()
             except Exception as e:
                 print(f"[warn] 无法自动打开 output 文件夹：{e}")
 